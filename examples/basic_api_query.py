@@ -1,12 +1,13 @@
 """Example: Using the API Expert agent"""
 
-import asyncio
-from src.utils import AgentRegistry
-from src.schemas import RevitContext
+import argparse
 
-async def main():
+async def main(use_cache: bool = True):
+    from src.utils import AgentRegistry
+    from src.schemas import RevitContext
+    
     # Initialize agent registry
-    registry = AgentRegistry()
+    registry = AgentRegistry(use_cache=use_cache)
     await registry.initialize_agents()
     
     # Get the API Expert agent
@@ -36,23 +37,30 @@ async def main():
         "Generate code to export the current view to DWG"
     ]
     
-    for query in queries:
+    # Dispatch all queries as one batch
+    results = await registry.process_many('api_expert', queries, context)
+    
+    for query, result in zip(queries, results):
         print(f"\n{'='*60}")
         print(f"Query: {query}")
         print('='*60)
         
-        try:
-            result = await api_expert.process(query, context)
-            print(f"\nOperation Type: {result.operation_type}")
-            print(f"Transaction Required: {result.transaction_required}")
-            print(f"\nCode Snippet:\n{result.code_snippet}")
-            print(f"\nExplanation: {result.explanation}")
+        if isinstance(result, Exception):
+            print(f"Error: {result}")
+            continue
             
-        except Exception as e:
-            print(f"Error: {e}")
+        print(f"\nOperation Type: {result.operation_type}")
+        print(f"Transaction Required: {result.transaction_required}")
+        print(f"\nCode Snippet:\n{result.code_snippet}")
+        print(f"\nExplanation: {result.explanation}")
             
     # Cleanup
     await registry.shutdown()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    from src.utils.runtime import run
+    
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the response cache')
+    args = parser.parse_args()
+    run(main(use_cache=not args.no_cache))
\ No newline at end of file
@@ -1,12 +1,13 @@
 """Example: Multi-agent coordination for MEP task"""
 
-import asyncio
-from src.utils import AgentRegistry
-from src.schemas import RevitContext
+import argparse
 
-async def main():
+async def main(use_cache: bool = True):
+    from src.utils import AgentRegistry
+    from src.schemas import RevitContext
+    
     # Initialize agent registry
-    registry = AgentRegistry()
+    registry = AgentRegistry(use_cache=use_cache)
     await registry.initialize_agents()
     
     # Get the orchestrator
@@ -38,7 +39,7 @@ async def main():
     
     try:
         # Get the plan from orchestrator
-        plan = await orchestrator.process(request, context)
+        plan = await registry.process('orchestrator', request, context)
         
         print(f"Task Type: {plan.task_type}")
         print(f"Expected Outcome: {plan.expected_outcome}")
@@ -76,4 +77,9 @@ async def main():
     await registry.shutdown()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    from src.utils.runtime import run
+    
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the response cache')
+    args = parser.parse_args()
+    run(main(use_cache=not args.no_cache))
\ No newline at end of file
@@ -2,10 +2,10 @@
 """Quick start script for Revit AI Assistant"""
 
 import asyncio
+import importlib
 import os
+import threading
 from pathlib import Path
-from src.utils import AgentRegistry
-from src.schemas import RevitContext
 
 print("""
 ╔═══════════════════════════════════════════════════════╗
@@ -16,6 +16,24 @@ print("""
 ╚═══════════════════════════════════════════════════════╝
 """)
 
+async def _probe_lmstudio() -> bool:
+    """Check for LM Studio on its default port"""
+    from src.utils.http import get_endpoint_client
+    # Through the agents' endpoint pool, so the connection is reused later
+    await get_endpoint_client("http://localhost:1234").head("/health", timeout=2.0)
+    return True
+
+async def _probe_ollama() -> bool:
+    """Check for Ollama on its default port"""
+    from src.utils.http import get_client
+    # /api/tags does not answer HEAD reliably, so ask for a single byte
+    await get_client().get(
+        "http://localhost:11434/api/tags",
+        headers={"Range": "bytes=0-0"},
+        timeout=2.0
+    )
+    return True
+
 async def check_setup():
     """Check if everything is set up correctly"""
     issues = []
@@ -29,20 +47,17 @@ async def check_setup():
         issues.append("⚠️  Configuration file missing")
     
     # Check for LM Studio/Ollama
-    try:
-        import httpx
-        async with httpx.AsyncClient() as client:
-            try:
-                await client.get("http://localhost:1234/health", timeout=2.0)
-                print("✅ LM Studio detected on port 1234")
-            except:
-                try:
-                    await client.get("http://localhost:11434/api/tags", timeout=2.0)
-                    print("✅ Ollama detected on port 11434")
-                except:
-                    issues.append("⚠️  No local LLM server detected (LM Studio/Ollama)")
-    except:
-        pass
+    lm_studio, ollama = await asyncio.gather(
+        _probe_lmstudio(),
+        _probe_ollama(),
+        return_exceptions=True
+    )
+    if lm_studio is True:
+        print("✅ LM Studio detected on port 1234")
+    if ollama is True:
+        print("✅ Ollama detected on port 11434")
+    if lm_studio is not True and ollama is not True:
+        issues.append("⚠️  No local LLM server detected (LM Studio/Ollama)")
     
     if issues:
         print("\n🔧 Setup Issues Found:")
@@ -53,17 +68,45 @@ async def check_setup():
     
     return True
 
-async def interactive_demo():
-    """Run an interactive demo"""
-    print("\n🚀 Starting Interactive Demo\n")
+async def _ainput(prompt: str) -> str:
+    """Read a line from stdin without blocking the event loop"""
+    # A daemon thread rather than to_thread, so Ctrl+C doesn't wait on input()
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def read():
+        try:
+            line = input(prompt)
+        except BaseException as e:
+            # Bind e now; Python unbinds it when the except block ends
+            loop.call_soon_threadsafe(lambda e=e: future.done() or future.set_exception(e))
+        else:
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(line))
+            
+    threading.Thread(target=read, daemon=True).start()
+    return await future
+
+async def _preload_agents():
+    """Import the agent stack on a worker thread"""
+    # A plain import would hold the loop for the whole pydantic_ai load
+    await asyncio.to_thread(importlib.import_module, "src.utils.agent_registry")
+
+async def _load_registry():
+    """Construct and initialize the agent registry"""
+    from src.utils import AgentRegistry
     
-    # Initialize registry
-    print("Loading agents...")
     registry = AgentRegistry()
     await registry.initialize_agents()
+    return registry
+
+async def interactive_demo(registry):
+    """Run an interactive demo"""
+    from src.schemas import RevitContext
+    
+    print("\n🚀 Starting Interactive Demo\n")
     
     agents = registry.list_agents()
-    print(f"\n✅ Loaded {len(agents)} agents: {', '.join(agents)}")
+    print(f"\n✅ Configured {len(agents)} agents: {', '.join(agents)}")
     
     # Create mock context
     context = RevitContext(
@@ -84,9 +127,12 @@ async def interactive_demo():
     print("3. Standards Agent - Check compliance with ASHRAE/BICSI/ASME")
     print("4. Orchestrator - Coordinate complex multi-agent tasks")
     
+    # Warm model connections while the user is choosing
+    warm_up_task = asyncio.create_task(registry.warm_up())
+    
     while True:
         print("\n" + "="*50)
-        agent_num = input("\nSelect agent (1-4) or 'q' to quit: ").strip()
+        agent_num = (await _ainput("\nSelect agent (1-4) or 'q' to quit: ")).strip()
         
         if agent_num.lower() == 'q':
             break
@@ -103,19 +149,19 @@ async def interactive_demo():
             print("Invalid selection")
             continue
             
-        agent = registry.get_agent(agent_name)
+        agent = await registry.aget_agent(agent_name)
         if not agent:
             print(f"{agent_name} not available")
             continue
             
-        query = input(f"\nEnter your query for {agent_name}: ").strip()
+        query = (await _ainput(f"\nEnter your query for {agent_name}: ")).strip()
         if not query:
             continue
             
         print(f"\n🤔 Processing with {agent_name}...")
         
         try:
-            result = await agent.process(query, context)
+            result = await registry.process(agent_name, query, context)
             
             print(f"\n✅ Result from {agent_name}:")
             print("-" * 40)
@@ -139,25 +185,40 @@ async def interactive_demo():
         except Exception as e:
             print(f"❌ Error: {e}")
     
+    warm_up_task.cancel()
     await registry.shutdown()
     print("\n👋 Thanks for trying Revit AI Assistant!")
 
 async def main():
     """Main entry point"""
     
-    # Check setup
-    print("🔍 Checking setup...")
-    if not await check_setup():
-        print("\n❌ Please complete setup before running the demo")
-        return
-    
-    print("\n✅ Setup looks good!")
+    # Import the agent stack off the loop while the setup checks run;
+    # agents themselves are only initialized once setup has passed
+    import_task = asyncio.create_task(_preload_agents())
     
-    # Run demo
-    await interactive_demo()
+    try:
+        # Check setup
+        print("🔍 Checking setup...")
+        if not await check_setup():
+            await asyncio.gather(import_task, return_exceptions=True)
+            print("\n❌ Please complete setup before running the demo")
+            return
+        
+        print("\n✅ Setup looks good!")
+        
+        # Run demo
+        print("Loading agents...")
+        await import_task
+        registry = await _load_registry()
+        await interactive_demo(registry)
+    finally:
+        from src.utils.http import aclose_clients
+        await aclose_clients()
 
 if __name__ == "__main__":
+    from src.utils.runtime import run
+    
     try:
-        asyncio.run(main())
+        run(main())
     except KeyboardInterrupt:
         print("\n\n👋 Goodbye!")
@@ -2,12 +2,25 @@
 """Download and setup local models for Revit AI Assistant"""
 
 import os
+import re
 import sys
 import yaml
-import subprocess
+import shutil
+import asyncio
+import functools
 from pathlib import Path
 import argparse
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# Line breaks and the terminal escapes ollama uses to redraw progress bars
+_LINE_BREAK = re.compile(rb'[\r\n]+')
+_ANSI_ESCAPE = re.compile(rb'\x1b\[[0-9;?]*[A-Za-z]')
+
+@functools.lru_cache(maxsize=1)
 def load_config():
     """Load model configuration"""
     config_path = Path("config/model_endpoints.yaml")
@@ -16,31 +29,61 @@ def load_config():
         sys.exit(1)
         
     with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_SafeLoader)
+
+async def _pull_ollama_model(model, semaphore):
+    """Pull a single model, returning (model, error message or None)"""
+    async with semaphore:
+        print(f"\nPulling {model}...")
+        proc = await asyncio.create_subprocess_exec(
+            'ollama', 'pull', model,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        last_line = await _last_stderr_line(proc.stderr)
+        await proc.wait()
+    if proc.returncode != 0:
+        return model, last_line or f"exit code {proc.returncode}"
+    return model, None
 
-def setup_ollama_models(config):
-    """Pull models using Ollama"""
+async def _last_stderr_line(stream):
+    """Drain a stream, keeping only its last non-empty line"""
+    # Progress frames for a multi-GB pull would otherwise all pile up in memory
+    last, pending = "", b""
+    while chunk := await stream.read(65536):
+        *lines, pending = _LINE_BREAK.split(pending + chunk)
+        for line in reversed(lines):
+            text = _ANSI_ESCAPE.sub(b'', line).decode(errors='replace').strip()
+            if text:
+                last = text
+                break
+    text = _ANSI_ESCAPE.sub(b'', pending).decode(errors='replace').strip()
+    return text or last
+
+async def setup_ollama_models(config, max_parallel=3):
+    """Pull models using Ollama, a few at a time"""
     print("\n=== Setting up Ollama models ===")
     models = config.get('ollama', {}).get('models', [])
     
-    for model in models:
-        print(f"\nPulling {model}...")
-        try:
-            subprocess.run(['ollama', 'pull', model], check=True)
+    if shutil.which('ollama') is None:
+        print("✗ Ollama not found. Please install from https://ollama.ai/")
+        return
+        
+    semaphore = asyncio.Semaphore(max_parallel)
+    pulls = [_pull_ollama_model(model, semaphore) for model in models]
+    for pull in asyncio.as_completed(pulls):
+        model, error = await pull
+        if error:
+            print(f"✗ Failed to pull {model}: {error}")
+        else:
             print(f"✓ Successfully pulled {model}")
-        except subprocess.CalledProcessError as e:
-            print(f"✗ Failed to pull {model}: {e}")
-        except FileNotFoundError:
-            print("✗ Ollama not found. Please install from https://ollama.ai/")
-            return
 
-def check_lm_studio():
+def check_lm_studio(config):
     """Check if LM Studio is available"""
     print("\n=== LM Studio Setup ===")
     print("Please ensure LM Studio is installed and running.")
     print("\nRecommended models to download in LM Studio:")
     
-    config = load_config()
     lm_models = config.get('lm_studio', {}).get('models', [])
     
     for model in lm_models:
@@ -100,10 +143,10 @@ def main():
     config = load_config()
     
     if args.all or args.ollama:
-        setup_ollama_models(config)
+        asyncio.run(setup_ollama_models(config))
     
     if args.all or args.lm_studio:
-        check_lm_studio()
+        check_lm_studio(config)
     
     if args.all:
         download_embeddings_model()
@@ -3,16 +3,24 @@
 Specialized agents for different Revit domains.
 """
 
-from .base_agent import BaseRevitAgent
-from .orchestrator import OrchestratorAgent
-from .api_expert import APIExpertAgent
-from .dynamo_agent import DynamoAgent
-from .standards_agent import StandardsAgent
+import importlib
 
-__all__ = [
-    'BaseRevitAgent',
-    'OrchestratorAgent', 
-    'APIExpertAgent',
-    'DynamoAgent',
-    'StandardsAgent'
-]
\ No newline at end of file
+# Agent class -> submodule; imported on first access (PEP 562) so that
+# pydantic_ai and model SDKs only load for the agents actually used
+_AGENTS = {
+    'BaseRevitAgent': 'base_agent',
+    'OrchestratorAgent': 'orchestrator',
+    'APIExpertAgent': 'api_expert',
+    'DynamoAgent': 'dynamo_agent',
+    'StandardsAgent': 'standards_agent'
+}
+
+__all__ = list(_AGENTS)
+
+def __getattr__(name):
+    if name in _AGENTS:
+        module = importlib.import_module(f".{_AGENTS[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
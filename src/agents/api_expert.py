@@ -1,11 +1,60 @@
 """API Expert Agent - Generates Revit API code"""
 
+import inspect
+import sys
 from typing import Dict, Any, List, Type
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent, RunContext
 from .base_agent import BaseRevitAgent
 from ..models.local_llm import LocalLLMModel
 
+# Static tool data, built once at import
+_COMMON_METHODS: Dict[str, List[str]] = {
+    "Wall": ["get_Parameter", "Flip", "get_Location", "get_BoundingBox"],
+    "Door": ["get_FromRoom", "get_ToRoom", "Flip", "get_Host"],
+    "View": ["SetCategoryHidden", "SetCategoryOverrides", "Duplicate"]
+}
+
+_API_PATTERNS: Dict[str, str] = {
+    "element_filter": """FilteredElementCollector collector = new FilteredElementCollector(doc)
+        .OfClass(typeof(Wall))
+        .WhereElementIsNotElementType();""",
+    "transaction": """using (Transaction trans = new Transaction(doc, "Description"))
+    {
+        trans.Start();
+        try
+        {
+            // Your code here
+            trans.Commit();
+        }
+        catch (Exception ex)
+        {
+            trans.RollBack();
+            TaskDialog.Show("Error", ex.Message);
+        }
+    }"""
+}
+
+_SYSTEM_PROMPT = sys.intern(inspect.cleandoc("""You are a Revit API expert with deep knowledge of:
+    - RevitAPI and RevitAPIUI namespaces
+    - Transaction handling and document modification
+    - Element filtering and LINQ queries  
+    - Parameter manipulation and shared parameters
+    - View creation and graphics overrides
+    - Custom IUpdater implementations
+    - Performance optimization techniques
+    - WorkSharing and Central model operations
+    
+    Always include:
+    1. Transaction wrapping with proper error handling
+    2. Null checks and defensive programming
+    3. Proper disposal of transactions
+    4. Try-catch blocks for API calls
+    5. Comments explaining complex operations
+    
+    Generate working C# or Python code for Revit API operations.
+    Prefer C# unless Python is specifically requested."""))
+
 class APIOperation(BaseModel):
     """Output from API Expert agent"""
     operation_type: str = Field(description="query, create, modify, delete")
@@ -19,6 +68,8 @@ class APIOperation(BaseModel):
 class APIExpertAgent(BaseRevitAgent):
     """Expert in Revit API code generation and best practices"""
     
+    system_prompt = _SYSTEM_PROMPT
+    
     def _setup_model(self, config: Dict[str, Any]):
         """Setup local CodeLlama model"""
         return LocalLLMModel(
@@ -35,25 +86,7 @@ class APIExpertAgent(BaseRevitAgent):
         ](
             self.model,
             output_type=APIOperation,
-            system_prompt="""You are a Revit API expert with deep knowledge of:
-            - RevitAPI and RevitAPIUI namespaces
-            - Transaction handling and document modification
-            - Element filtering and LINQ queries  
-            - Parameter manipulation and shared parameters
-            - View creation and graphics overrides
-            - Custom IUpdater implementations
-            - Performance optimization techniques
-            - WorkSharing and Central model operations
-            
-            Always include:
-            1. Transaction wrapping with proper error handling
-            2. Null checks and defensive programming
-            3. Proper disposal of transactions
-            4. Try-catch blocks for API calls
-            5. Comments explaining complex operations
-            
-            Generate working C# or Python code for Revit API operations.
-            Prefer C# unless Python is specifically requested."""
+            system_prompt=self.system_prompt
         )
         
         # Add tools
@@ -69,36 +102,12 @@ class APIExpertAgent(BaseRevitAgent):
         async def get_element_methods(ctx: RunContext[Any], element_class: str) -> List[str]:
             """Get available methods for a Revit element class"""
             # This would use reflection or pre-indexed data
-            common_methods = {
-                "Wall": ["get_Parameter", "Flip", "get_Location", "get_BoundingBox"],
-                "Door": ["get_FromRoom", "get_ToRoom", "Flip", "get_Host"],
-                "View": ["SetCategoryHidden", "SetCategoryOverrides", "Duplicate"]
-            }
-            return common_methods.get(element_class, [])
+            return _COMMON_METHODS.get(element_class, [])
             
         @agent.tool
         async def get_common_patterns(ctx: RunContext[Any], pattern_type: str) -> str:
             """Get common Revit API code patterns"""
-            patterns = {
-                "element_filter": """FilteredElementCollector collector = new FilteredElementCollector(doc)
-                    .OfClass(typeof(Wall))
-                    .WhereElementIsNotElementType();""",
-                "transaction": """using (Transaction trans = new Transaction(doc, "Description"))
-                {
-                    trans.Start();
-                    try
-                    {
-                        // Your code here
-                        trans.Commit();
-                    }
-                    catch (Exception ex)
-                    {
-                        trans.RollBack();
-                        TaskDialog.Show("Error", ex.Message);
-                    }
-                }"""
-            }
-            return patterns.get(pattern_type, "Pattern not found")
+            return _API_PATTERNS.get(pattern_type, "Pattern not found")
             
         return agent
         
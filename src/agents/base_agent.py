@@ -9,11 +9,22 @@ import logging
 class BaseRevitAgent(ABC):
     """Base class for all Revit AI agents"""
     
+    # Subclasses set this to the prompt passed to their PydanticAI agent
+    system_prompt: str = ""
+    
     def __init__(self, model_config: Dict[str, Any], name: str):
         self.name = name
         self.logger = logging.getLogger(f"agent.{name}")
         self.model = self._setup_model(model_config)
+        if self.system_prompt and hasattr(self.model, "pin_system_prompt"):
+            self.model.pin_system_prompt(self.system_prompt)
         self.agent = self._create_agent()
+        # Inputs never change after construction, so build this once
+        self._capabilities = {
+            "name": self.name,
+            "output_type": self.get_output_type().__name__,
+            "description": self.__class__.__doc__
+        }
         self.logger.info(f"Initialized {name} agent")
         
     @abstractmethod
@@ -33,19 +44,15 @@ class BaseRevitAgent(ABC):
         
     async def process(self, query: str, context: Any) -> BaseModel:
         """Process a query with context"""
-        self.logger.info(f"Processing query: {query[:100]}...")
+        self.logger.info("Processing query: %.100s...", query)
         try:
             result = await self.agent.run(query, deps=context)
-            self.logger.info(f"Successfully processed query")
+            self.logger.info("Successfully processed query")
             return result.data
         except Exception as e:
             self.logger.error(f"Error processing query: {e}")
             raise
             
     def get_capabilities(self) -> Dict[str, Any]:
-        """Return agent capabilities for discovery"""
-        return {
-            "name": self.name,
-            "output_type": self.get_output_type().__name__,
-            "description": self.__class__.__doc__
-        }
\ No newline at end of file
+        """Return agent capabilities for discovery (shared; do not mutate)"""
+        return self._capabilities
\ No newline at end of file
@@ -1,13 +1,87 @@
 """Orchestrator Agent - Coordinates all other agents using Claude"""
 
-from typing import Dict, Any, List, Type
-from pydantic import BaseModel, Field
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Type
+from pydantic import BaseModel, ConfigDict, Field
 from pydantic_ai import Agent, RunContext
 from .base_agent import BaseRevitAgent
 import asyncio
+import inspect
+import re
+import sys
+from collections import defaultdict, deque
+
+# Static tool data, built once at import
+_COMPLEXITY_KEYWORDS = (
+    # (category, keywords) in priority order; first matching category wins
+    ("high", ("entire", "all", "coordinate", "multi", "phase")),
+    ("low", ("single", "one", "specific", "quick")),
+)
+
+def _compile_rules(rules):
+    """Compile each category's keywords into one case-insensitive pattern
+    
+    Categories stay separate patterns so a match for one can never
+    consume text that overlaps a higher-priority category's keyword.
+    """
+    return tuple(
+        (category, re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE))
+        for category, keywords in rules
+    )
+
+def _classify(text: str, rules, default: str) -> str:
+    """Return the first category whose pattern occurs in text"""
+    for category, pattern in rules:
+        if pattern.search(text):
+            return category
+    return default
+
+_COMPLEXITY_RULES = _compile_rules(_COMPLEXITY_KEYWORDS)
+
+_TIME_ESTIMATES: Dict[str, str] = {
+    "low": "1-5 minutes",
+    "medium": "5-15 minutes",
+    "high": "15-60 minutes"
+}
+
+_PREREQUISITES: Dict[str, List[str]] = {
+    "mep_coordination": ["Current phase must be defined", "Systems must be modeled"],
+    "standards_check": ["Standards database must be loaded", "Elements to check must be selected"],
+    "export": ["Views must be set up", "Export settings defined"]
+}
+
+_SYSTEM_PROMPT = sys.intern(inspect.cleandoc("""You are the master orchestrator for a Revit AI assistant system.
+    You coordinate specialized agents to complete complex architectural tasks.
+    
+    Available agents and their capabilities:
+    - api_expert: Generates Revit API code (C#/Python)
+    - dynamo: Creates visual programming scripts
+    - temporal_chief: Manages project phasing
+    - visibility: Troubleshoots graphics and view issues
+    - export_manager: Handles file exports (DWG, IFC, NWC)
+    - import_manager: Manages imports and links
+    - family_builder: Creates system families
+    - component_modeler: Designs .RFA components
+    - coordinate_manager: Handles survey/project coordinates
+    - standards: Checks ASHRAE/BICSI/ASME compliance
+    
+    Your role:
+    1. Understand the user's request
+    2. Break it into agent-specific tasks
+    3. Determine task dependencies
+    4. Create an execution plan
+    5. Monitor progress (conceptually)
+    
+    Important:
+    - You only plan and coordinate
+    - All actual work is done by local agents
+    - Project data never leaves the user's machine
+    - Prioritize safety and standards compliance
+    - Consider performance and user experience"""))
 
 class AgentTask(BaseModel):
     """Single task for an agent"""
+    model_config = ConfigDict(defer_build=True)
+    
     agent_name: str = Field(description="Which agent to use")
     task_description: str = Field(description="What the agent should do")
     dependencies: List[str] = Field(default_factory=list, description="Tasks that must complete first")
@@ -15,6 +89,8 @@ class AgentTask(BaseModel):
     
 class RevitTask(BaseModel):
     """Output from Orchestrator agent"""
+    model_config = ConfigDict(defer_build=True)
+    
     task_type: str = Field(description="Type of overall task")
     tasks: List[AgentTask] = Field(description="Individual agent tasks")
     coordination_plan: str = Field(description="How tasks will be coordinated")
@@ -25,9 +101,15 @@ class RevitTask(BaseModel):
 class OrchestratorAgent(BaseRevitAgent):
     """Orchestrates complex multi-agent workflows"""
     
-    def __init__(self, model_config: Dict[str, Any], agent_registry: Dict[str, BaseRevitAgent]):
+    system_prompt = _SYSTEM_PROMPT
+    
+    def __init__(self, model_config: Dict[str, Any], agent_registry: Mapping[str, BaseRevitAgent],
+                 dispatch: Optional[Callable[[str, str, Any], Awaitable[Any]]] = None):
         """Initialize with access to all other agents"""
         self.agent_registry = agent_registry
+        # Runs (agent_name, query, context); the registry passes its process()
+        # so plan tasks share its concurrency limit and response cache
+        self.dispatch = dispatch
         super().__init__(model_config, "orchestrator")
         
     def _setup_model(self, config: Dict[str, Any]):
@@ -47,110 +129,116 @@ class OrchestratorAgent(BaseRevitAgent):
         ](
             self.model,
             output_type=RevitTask,
-            system_prompt="""You are the master orchestrator for a Revit AI assistant system.
-            You coordinate specialized agents to complete complex architectural tasks.
-            
-            Available agents and their capabilities:
-            - api_expert: Generates Revit API code (C#/Python)
-            - dynamo: Creates visual programming scripts
-            - temporal_chief: Manages project phasing
-            - visibility: Troubleshoots graphics and view issues
-            - export_manager: Handles file exports (DWG, IFC, NWC)
-            - import_manager: Manages imports and links
-            - family_builder: Creates system families
-            - component_modeler: Designs .RFA components
-            - coordinate_manager: Handles survey/project coordinates
-            - standards: Checks ASHRAE/BICSI/ASME compliance
-            
-            Your role:
-            1. Understand the user's request
-            2. Break it into agent-specific tasks
-            3. Determine task dependencies
-            4. Create an execution plan
-            5. Monitor progress (conceptually)
-            
-            Important:
-            - You only plan and coordinate
-            - All actual work is done by local agents
-            - Project data never leaves the user's machine
-            - Prioritize safety and standards compliance
-            - Consider performance and user experience"""
+            system_prompt=self.system_prompt
         )
         
         # Add orchestration tools
         @agent.tool
         async def get_agent_capabilities(ctx: RunContext[Any], agent_name: str) -> Dict[str, Any]:
             """Get capabilities of a specific agent"""
-            if agent_name in self.agent_registry:
-                return self.agent_registry[agent_name].get_capabilities()
+            # get() rather than membership: a configured agent may still fail to build
+            agent = self.agent_registry.get(agent_name)
+            if agent:
+                return agent.get_capabilities()
             return {"error": f"Unknown agent: {agent_name}"}
             
         @agent.tool
         async def estimate_task_complexity(ctx: RunContext[Any], task: str) -> Dict[str, Any]:
             """Estimate complexity and time for a task"""
             # Simple heuristic based on keywords
-            complex_keywords = ["entire", "all", "coordinate", "multi", "phase"]
-            simple_keywords = ["single", "one", "specific", "quick"]
-            
-            complexity = "medium"
-            if any(kw in task.lower() for kw in complex_keywords):
-                complexity = "high"
-            elif any(kw in task.lower() for kw in simple_keywords):
-                complexity = "low"
+            complexity = _classify(task, _COMPLEXITY_RULES, "medium")
                 
-            time_estimates = {
-                "low": "1-5 minutes",
-                "medium": "5-15 minutes",
-                "high": "15-60 minutes"
-            }
-            
             return {
                 "complexity": complexity,
-                "estimated_time": time_estimates[complexity],
+                "estimated_time": _TIME_ESTIMATES[complexity],
                 "agent_count": 1 if complexity == "low" else 2 if complexity == "medium" else 3
             }
             
         @agent.tool
         async def check_prerequisites(ctx: RunContext[Any], task_type: str) -> List[str]:
             """Check what needs to be in place for a task"""
-            prerequisites = {
-                "mep_coordination": ["Current phase must be defined", "Systems must be modeled"],
-                "standards_check": ["Standards database must be loaded", "Elements to check must be selected"],
-                "export": ["Views must be set up", "Export settings defined"]
-            }
-            return prerequisites.get(task_type, [])
+            return _PREREQUISITES.get(task_type, [])
             
         return agent
         
     def get_output_type(self) -> Type[BaseModel]:
         return RevitTask
         
+    def _start_task(self, name: str, query: str, context: Any) -> Optional[Awaitable[Any]]:
+        """Coroutine running one plan task, or None for an unknown agent"""
+        if name not in self.agent_registry:
+            return None
+        if self.dispatch:
+            # The dispatcher builds the agent itself, off the loop
+            return self.dispatch(name, query, context)
+        agent = self.agent_registry.get(name)
+        return agent.process(query, context) if agent else None
+        
     async def execute_plan(self, plan: RevitTask, context: Any) -> Dict[str, Any]:
-        """Execute the orchestrated plan using local agents"""
+        """Execute the orchestrated plan using local agents
+        
+        Every task whose dependencies have completed runs concurrently;
+        the scheduler wakes as soon as any running task finishes.
+        """
         results = {}
-        completed_tasks = set()
+        tasks = {task.agent_name: task for task in plan.tasks}
         
-        # Simple dependency resolution
-        while len(completed_tasks) < len(plan.tasks):
-            for task in plan.tasks:
-                if task.agent_name in completed_tasks:
-                    continue
+        # Count unmet dependencies once and decrement as tasks finish,
+        # rather than rescanning every task's dependencies per sweep
+        unmet: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        for name, task in tasks.items():
+            dependencies = set(task.dependencies)
+            unmet[name] = len(dependencies)
+            for dep in dependencies:
+                dependents[dep].append(name)
+        ready = deque(name for name, count in unmet.items() if count == 0)
+        in_flight: Dict[str, asyncio.Task] = {}
+        
+        def mark_complete(name: str):
+            for child in dependents[name]:
+                unmet[child] -= 1
+                if unmet[child] == 0:
+                    ready.append(child)
                     
-                # Check dependencies
-                if all(dep in completed_tasks for dep in task.dependencies):
-                    agent = self.agent_registry.get(task.agent_name)
-                    if agent:
-                        self.logger.info(f"Executing task: {task.agent_name} - {task.task_description}")
-                        try:
-                            result = await agent.process(task.task_description, context)
-                            results[task.agent_name] = result
-                            completed_tasks.add(task.agent_name)
-                        except Exception as e:
-                            self.logger.error(f"Task failed: {task.agent_name} - {e}")
-                            results[task.agent_name] = {"error": str(e)}
-                            completed_tasks.add(task.agent_name)
-                            
-            # Avoid infinite loop
-            await asyncio.sleep(0.1)
-            
+        try:
+            while ready or in_flight:
+                # Launch everything that is ready; tasks for unknown agents
+                # fail immediately and may unblock others in the same sweep
+                while ready:
+                    name = ready.popleft()
+                    run = self._start_task(name, tasks[name].task_description, context)
+                    if run is None:
+                        self.logger.error(f"Task failed: {name} - unknown agent")
+                        results[name] = {"error": f"Unknown agent: {name}"}
+                        mark_complete(name)
+                        continue
+                    self.logger.info("Executing task: %s - %.200s", name, tasks[name].task_description)
+                    in_flight[name] = asyncio.create_task(run, name=name)
+                    
+                if not in_flight:
+                    break
+                    
+                done, _ = await asyncio.wait(
+                    in_flight.values(),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for finished in done:
+                    name = finished.get_name()
+                    del in_flight[name]
+                    try:
+                        results[name] = finished.result()
+                    except Exception as e:
+                        self.logger.error(f"Task failed: {name} - {e}")
+                        results[name] = {"error": str(e)}
+                    mark_complete(name)
+        finally:
+            for running in in_flight.values():
+                running.cancel()
+                
+        unresolved = [name for name in tasks if name not in results]
+        if unresolved:
+            raise RuntimeError(
+                f"Unresolved dependencies for tasks: {', '.join(unresolved)}"
+            )
         return results
\ No newline at end of file
@@ -1,11 +1,54 @@
 """Standards Compliance Agent - Checks against ASHRAE, BICSI, ASME"""
 
+import inspect
+import sys
 from typing import Dict, Any, List, Type
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent, RunContext
 from .base_agent import BaseRevitAgent
 from ..models.local_llm import LocalLLMModel
 
+# Static tool data, built once at import
+_REQUIREMENTS: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "ASHRAE": {
+        "ductwork": {
+            "velocity_limits": {"supply": 2000, "return": 1500},
+            "insulation_r_value": 6.0,
+            "leakage_class": "Class A"
+        },
+        "ventilation": {
+            "outdoor_air_rate": "0.06 cfm/sqft + 5 cfm/person",
+            "minimum_filtration": "MERV 13"
+        }
+    }
+}
+
+_SYSTEM_PROMPT = sys.intern(inspect.cleandoc("""You are an engineering standards compliance expert.
+    You ensure all building systems comply with:
+    
+    ASHRAE Standards:
+    - 90.1: Energy Standard for Buildings
+    - 62.1: Ventilation for Acceptable Indoor Air Quality
+    - 55: Thermal Environmental Conditions
+    - 189.1: Green Buildings
+    
+    BICSI Standards:
+    - 002: Data Center Design and Implementation
+    - TDMM: Telecommunications Distribution Methods Manual
+    - 007: Information Communication Technology Design and Implementation
+    
+    ASME Standards:
+    - B31.1: Power Piping
+    - B31.3: Process Piping
+    - A17.1: Safety Code for Elevators
+    
+    Always:
+    1. Cite specific sections and requirements
+    2. Provide quantitative thresholds
+    3. Suggest practical solutions
+    4. Consider local amendments
+    5. Flag critical safety violations immediately"""))
+
 class ComplianceCheck(BaseModel):
     """Output from Standards Agent"""
     standard: str = Field(description="ASHRAE, BICSI, ASME, or Local Code")
@@ -19,6 +62,8 @@ class ComplianceCheck(BaseModel):
 class StandardsAgent(BaseRevitAgent):
     """Ensures compliance with engineering standards using RAG"""
     
+    system_prompt = _SYSTEM_PROMPT
+    
     def _setup_model(self, config: Dict[str, Any]):
         """Setup Mixtral MoE for complex reasoning"""
         return LocalLLMModel(
@@ -35,31 +80,7 @@ class StandardsAgent(BaseRevitAgent):
         ](
             self.model,
             output_type=ComplianceCheck,
-            system_prompt="""You are an engineering standards compliance expert.
-            You ensure all building systems comply with:
-            
-            ASHRAE Standards:
-            - 90.1: Energy Standard for Buildings
-            - 62.1: Ventilation for Acceptable Indoor Air Quality
-            - 55: Thermal Environmental Conditions
-            - 189.1: Green Buildings
-            
-            BICSI Standards:
-            - 002: Data Center Design and Implementation
-            - TDMM: Telecommunications Distribution Methods Manual
-            - 007: Information Communication Technology Design and Implementation
-            
-            ASME Standards:
-            - B31.1: Power Piping
-            - B31.3: Process Piping
-            - A17.1: Safety Code for Elevators
-            
-            Always:
-            1. Cite specific sections and requirements
-            2. Provide quantitative thresholds
-            3. Suggest practical solutions
-            4. Consider local amendments
-            5. Flag critical safety violations immediately"""
+            system_prompt=self.system_prompt
         )
         
         # Add RAG tools
@@ -83,20 +104,7 @@ class StandardsAgent(BaseRevitAgent):
                                           standard: str) -> Dict[str, Any]:
             """Get specific requirements for a component"""
             # This would query structured standards data
-            requirements = {
-                "ASHRAE": {
-                    "ductwork": {
-                        "velocity_limits": {"supply": 2000, "return": 1500},
-                        "insulation_r_value": 6.0,
-                        "leakage_class": "Class A"
-                    },
-                    "ventilation": {
-                        "outdoor_air_rate": "0.06 cfm/sqft + 5 cfm/person",
-                        "minimum_filtration": "MERV 13"
-                    }
-                }
-            }
-            return requirements.get(standard, {}).get(component, {})
+            return _REQUIREMENTS.get(standard, {}).get(component, {})
             
         @agent.tool
         async def check_local_amendments(ctx: RunContext[Any], 
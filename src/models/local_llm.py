@@ -2,96 +2,330 @@
 
 import httpx
 import asyncio
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+import hashlib
 import json
 import logging
+import math
+import operator
+import time
+
+from ..utils.http import get_endpoint_client
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+    _loads = json.loads
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
+async def _sse_data(response: httpx.Response):
+    """Yield the raw bytes of each SSE 'data:' line
+    
+    Splits the byte stream by hand instead of using aiter_lines(), so
+    framing is never decoded to str and payloads go to the JSON parser
+    as bytes.
+    """
+    buffer = bytearray()
+    async for chunk in response.aiter_bytes(8192):
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end == -1:
+                break
+            line = bytes(buffer[start:end]).rstrip(b"\r")
+            start = end + 1
+            if line.startswith(b"data: "):
+                yield line[6:]
+        del buffer[:start]
+    line = bytes(buffer).rstrip(b"\r")
+    if line.startswith(b"data: "):
+        yield line[6:]
 
 class LocalLLMModel:
     """Wrapper for local LLM endpoints (OpenAI-compatible)"""
     
-    def __init__(self, endpoint: str, model_name: str, context_length: int = 8192):
+    def __init__(self, endpoint: str, model_name: str, context_length: int = 8192,
+                 cache_size: int = 256, cache_ttl: Optional[float] = 3600.0,
+                 similarity_threshold: Optional[float] = None,
+                 embedding_model: Optional[str] = None,
+                 cache_prompt: bool = True, keep_alive: Optional[str] = "10m"):
+        """Configure the endpoint client and response caches
+        
+        Completions are cached by exact prompt and parameters. Setting
+        similarity_threshold (e.g. 0.95) adds a semantic tier that reuses a
+        response when the prompt embedding from /v1/embeddings is at least
+        that cosine-similar to a cached one.
+        
+        cache_prompt (llama.cpp) and keep_alive (Ollama) ask the server to
+        keep the KV cache for the pinned system prompt between requests;
+        servers that don't know these fields ignore them.
+        """
         self.endpoint = endpoint.rstrip('/')
         self.model_name = model_name
         self.context_length = context_length
-        self.client = httpx.AsyncClient(
-            base_url=endpoint,
-            timeout=120.0  # Longer timeout for local models
-        )
+        self.cache_prompt = cache_prompt
+        self.keep_alive = keep_alive
+        self.system_prompt: Optional[str] = None
         self.logger = logging.getLogger(f"model.{model_name}")
         
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.similarity_threshold = similarity_threshold
+        self.embedding_model = embedding_model
+        self._exact_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # (params key, embedding, norm, created, response)
+        self._semantic_cache: List[Tuple[str, List[float], float, float, Dict[str, Any]]] = []
+        self._inflight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        self.model_info_ttl = 300.0
+        self._model_info_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled client for this endpoint on the running loop"""
+        # Looked up per request: pools are per loop and may be closed under us
+        return get_endpoint_client(self.endpoint)
+        
+    def pin_system_prompt(self, text: str):
+        """Send text as the system message of every request
+        
+        Keeping it byte-identical across calls lets the server reuse the
+        prefix KV cache instead of re-running prefill over it.
+        """
+        self.system_prompt = text
+        
+    def _messages(self, prompt: str) -> List[Dict[str, str]]:
+        messages = [{"role": "user", "content": prompt}]
+        if self.system_prompt:
+            messages.insert(0, {"role": "system", "content": self.system_prompt})
+        return messages
+        
+    def _payload(self, prompt: str, stream: bool, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        payload = {
+            "model": self.model_name,
+            "messages": self._messages(prompt),
+            "max_tokens": kwargs.get("max_tokens", 2048),
+            "temperature": kwargs.get("temperature", 0.7),
+            "stream": stream
+        }
+        if self.cache_prompt:
+            payload["cache_prompt"] = True
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        payload.update(kwargs)
+        return payload
+        
+    def _params_key(self, kwargs: Dict[str, Any]) -> str:
+        return json.dumps([self.system_prompt, kwargs], sort_keys=True, default=str)
+        
+    def _cache_key(self, prompt: str, params: str) -> str:
+        return hashlib.sha1(f"{self.model_name}|{params}|{prompt}".encode()).hexdigest()
+        
+    def _expired(self, created: float) -> bool:
+        return self.cache_ttl is not None and time.monotonic() - created > self.cache_ttl
+        
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._exact_cache.get(key)
+        if entry is None:
+            return None
+        created, response = entry
+        if self._expired(created):
+            del self._exact_cache[key]
+            return None
+        self._exact_cache.move_to_end(key)
+        return response
+        
+    def _cache_put(self, key: str, response: Dict[str, Any]):
+        self._exact_cache[key] = (time.monotonic(), response)
+        self._exact_cache.move_to_end(key)
+        while len(self._exact_cache) > self.cache_size:
+            self._exact_cache.popitem(last=False)
+            
+    async def _embed(self, text: str) -> Optional[List[float]]:
+        """Embed text via the endpoint, or None if embeddings are unavailable"""
+        try:
+            response = await self.client.post(
+                "/v1/embeddings",
+                content=_dumps({"model": self.embedding_model or self.model_name, "input": text}),
+                headers=_JSON_HEADERS
+            )
+            response.raise_for_status()
+            return _loads(response.content)["data"][0]["embedding"]
+        except Exception as e:
+            self.logger.debug("Embedding unavailable, skipping semantic cache: %s", e)
+            return None
+            
+    def _semantic_get(self, params: str, embedding: List[float]) -> Optional[Dict[str, Any]]:
+        norm = math.sqrt(sum(map(operator.mul, embedding, embedding)))
+        if not norm:
+            return None
+        self._semantic_cache = [e for e in self._semantic_cache if not self._expired(e[3])]
+        best, best_score = None, self.similarity_threshold
+        for entry_params, vector, vector_norm, _, response in self._semantic_cache:
+            if entry_params != params:
+                continue
+            score = sum(map(operator.mul, embedding, vector)) / (norm * vector_norm)
+            if score >= best_score:
+                best, best_score = response, score
+        return best
+        
+    def _semantic_put(self, params: str, embedding: List[float], response: Dict[str, Any]):
+        norm = math.sqrt(sum(map(operator.mul, embedding, embedding)))
+        if not norm:
+            return
+        self._semantic_cache.append((params, embedding, norm, time.monotonic(), response))
+        del self._semantic_cache[:-self.cache_size or None]
+        
     async def complete(self, prompt: str, **kwargs) -> Dict[str, Any]:
-        """Complete a prompt using the local model"""
+        """Complete a prompt using the local model, serving repeats from cache"""
+        params = self._params_key(kwargs)
+        key = self._cache_key(prompt, params)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+            
+        # Coalesce concurrent identical requests onto a single HTTP call;
+        # shield so one caller's cancellation doesn't cancel the others
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._complete_uncached(prompt, key, params, kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+        
+    async def _complete_uncached(self, prompt: str, key: str, params: str,
+                                 kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Semantic-cache lookup and request for an exact-cache miss"""
+        embedding = None
+        if self.similarity_threshold is not None:
+            embedding = await self._embed(prompt)
+            if embedding is not None:
+                cached = self._semantic_get(params, embedding)
+                if cached is not None:
+                    self._cache_put(key, cached)
+                    return cached
+                    
         try:
             # OpenAI-compatible endpoint
             response = await self.client.post(
                 "/v1/chat/completions",
-                json={
-                    "model": self.model_name,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": kwargs.get("max_tokens", 2048),
-                    "temperature": kwargs.get("temperature", 0.7),
-                    "stream": False,
-                    **kwargs
-                }
+                content=_dumps(self._payload(prompt, False, kwargs)),
+                headers=_JSON_HEADERS
             )
             response.raise_for_status()
-            return response.json()
+            result = _loads(response.content)
         except Exception as e:
             self.logger.error(f"Completion error: {e}")
             raise
             
+        self._cache_put(key, result)
+        if embedding is not None:
+            self._semantic_put(params, embedding, result)
+        return result
+            
     async def stream_complete(self, prompt: str, **kwargs):
         """Stream completions from the local model"""
+        cached = self._cache_get(self._cache_key(prompt, self._params_key(kwargs)))
+        if cached is not None:
+            # Replay a cached completion as a single chunk
+            choice = cached["choices"][0]
+            yield {
+                "id": cached.get("id"),
+                "object": "chat.completion.chunk",
+                "model": cached.get("model", self.model_name),
+                "choices": [{
+                    "index": 0,
+                    "delta": choice["message"],
+                    "finish_reason": choice.get("finish_reason")
+                }]
+            }
+            return
+            
         try:
             async with self.client.stream(
                 "POST",
                 "/v1/chat/completions",
-                json={
-                    "model": self.model_name,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": kwargs.get("max_tokens", 2048),
-                    "temperature": kwargs.get("temperature", 0.7),
-                    "stream": True,
-                    **kwargs
-                }
+                content=_dumps(self._payload(prompt, True, kwargs)),
+                headers=_JSON_HEADERS
             ) as response:
                 response.raise_for_status()
-                async for line in response.aiter_lines():
-                    if line.startswith("data: "):
-                        data = line[6:]
-                        if data == "[DONE]":
-                            break
-                        try:
-                            chunk = json.loads(data)
-                            yield chunk
-                        except json.JSONDecodeError:
-                            continue
+                async for data in _sse_data(response):
+                    if data == b"[DONE]":
+                        break
+                    try:
+                        chunk = _loads(data)
+                    except json.JSONDecodeError:  # orjson's error subclasses this
+                        continue
+                    yield chunk
         except Exception as e:
             self.logger.error(f"Stream error: {e}")
             raise
             
+    async def stream_complete_batched(self, prompt: str, batch_size: int = 8,
+                                      flush_interval: float = 0.004, **kwargs):
+        """Stream completions in lists of chunks rather than one at a time
+        
+        A batch is yielded once it holds batch_size chunks or flush_interval
+        seconds have passed since its first chunk arrived, so fast local
+        models cost the consumer one await per batch instead of one per token.
+        """
+        loop = asyncio.get_running_loop()
+        batch: List[Dict[str, Any]] = []
+        started = 0.0
+        async for chunk in self.stream_complete(prompt, **kwargs):
+            now = loop.time()
+            if not batch:
+                started = now  # Time-to-first-token must not count against the window
+            batch.append(chunk)
+            if len(batch) >= batch_size or now - started >= flush_interval:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+            
     async def get_model_info(self) -> Dict[str, Any]:
-        """Get information about the loaded model"""
+        """Get information about the loaded model, cached for model_info_ttl seconds"""
+        now = time.monotonic()
+        if self._model_info_cache and now - self._model_info_cache[0] < self.model_info_ttl:
+            return self._model_info_cache[1]
         try:
             response = await self.client.get("/v1/models")
             response.raise_for_status()
-            return response.json()
+            info = _loads(response.content)
         except:
+            # Not cached, so the next call retries the server
             return {"model": self.model_name, "context_length": self.context_length}
+        self._model_info_cache = (now, info)
+        return info
+        
+    def invalidate_model_info(self):
+        """Drop cached model metadata, e.g. after swapping models on the server"""
+        self._model_info_cache = None
             
     async def health_check(self) -> bool:
         """Check if the model endpoint is responsive"""
         try:
-            response = await self.client.get("/health")
-            return response.status_code == 200
-        except:
+            response = await self.client.head("/health")
+            if response.status_code not in (405, 501):
+                return response.status_code == 200
+            # Server doesn't do HEAD; check the status line without reading the body
+            async with self.client.stream("GET", "/health") as response:
+                return response.status_code == 200
+        except httpx.HTTPError:
             return False
             
     async def __aenter__(self):
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
+        # The pooled client outlives this model; see utils.http.aclose_clients()
+        pass
         
     # PydanticAI compatibility methods
     async def request(self, messages: List[Dict[str, str]], **kwargs) -> str:
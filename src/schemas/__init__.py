@@ -6,7 +6,8 @@ from .revit_types import (
     RevitView,
     ElementVisibility,
     CoordinateSystem,
-    RevitContext
+    RevitContext,
+    dump_elements
 )
 
 __all__ = [
@@ -15,5 +16,6 @@ __all__ = [
     'RevitView',
     'ElementVisibility',
     'CoordinateSystem',
-    'RevitContext'
+    'RevitContext',
+    'dump_elements'
 ]
\ No newline at end of file
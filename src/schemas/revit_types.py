@@ -1,28 +1,53 @@
 """Pydantic models representing Revit types"""
 
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+import sys
+from typing import List, Dict, Any, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
 from dataclasses import dataclass
 from datetime import datetime
 
 class RevitElement(BaseModel):
     """Base Revit element representation"""
-    id: str = Field(description="Element ID")
-    category: str = Field(description="Element category")
-    family: Optional[str] = Field(None, description="Family name if applicable")
-    type: Optional[str] = Field(None, description="Type name")
-    level: Optional[str] = Field(None, description="Associated level")
+    id: str
+    category: str
+    family: Optional[str] = None  # Family name if applicable
+    type: Optional[str] = None  # Type name
+    level: Optional[str] = None  # Associated level
     parameters: Dict[str, Any] = Field(default_factory=dict)
     
+    @field_validator('category', 'family', 'type', 'level', mode='before')
+    @classmethod
+    def _intern(cls, v: Any) -> Any:
+        """Share one string object per distinct name across large element sets"""
+        return sys.intern(v) if isinstance(v, str) else v
+        
+    @classmethod
+    def parse_batch(cls, raw: Union[str, bytes]) -> List["RevitElement"]:
+        """Parse and validate a JSON array of elements in one pydantic-core call"""
+        return _ELEMENTS_ADAPTER.validate_json(raw)
+        
+_ELEMENTS_ADAPTER = TypeAdapter(List[RevitElement])
+
+def dump_elements(elements: List[RevitElement]) -> bytes:
+    """Serialize an element batch to JSON bytes in one pydantic-core call"""
+    return _ELEMENTS_ADAPTER.dump_json(elements)
+    
 class RevitPhase(BaseModel):
     """Project phase information"""
+    model_config = ConfigDict(frozen=True)
+    
     id: str
     name: str
     sequence_number: int
     description: Optional[str] = None
     
+    def __hash__(self) -> int:
+        return hash(self.id)
+        
 class RevitView(BaseModel):
     """View information"""
+    model_config = ConfigDict(frozen=True)
+    
     id: str
     name: str
     view_type: str  # FloorPlan, Section, 3D, etc.
@@ -30,8 +55,13 @@ class RevitView(BaseModel):
     phase: Optional[str] = None
     scale: Optional[int] = None
     
+    def __hash__(self) -> int:
+        return hash(self.id)
+        
 class ElementVisibility(BaseModel):
     """Element visibility settings"""
+    model_config = ConfigDict(frozen=True)
+    
     element_id: str
     view_id: str
     is_visible: bool
@@ -39,8 +69,14 @@ class ElementVisibility(BaseModel):
     is_hidden_by_filter: bool = False
     override_settings: Dict[str, Any] = Field(default_factory=dict)
     
+    def __hash__(self) -> int:
+        # override_settings is a dict, so hash on the identifying pair only
+        return hash((self.element_id, self.view_id))
+        
 class CoordinateSystem(BaseModel):
     """Project coordinate information"""
+    model_config = ConfigDict(frozen=True)
+    
     survey_point: tuple[float, float, float]
     project_base_point: tuple[float, float, float]
     true_north_rotation: float
@@ -48,14 +84,21 @@ class CoordinateSystem(BaseModel):
     
 class ExportSettings(BaseModel):
     """Export configuration"""
-    format: str = Field(description="DWG, IFC, NWC, FBX, etc.")
-    view_ids: List[str] = Field(description="Views to export")
+    format: str  # DWG, IFC, NWC, FBX, etc.
+    view_ids: List[str]  # Views to export
     settings: Dict[str, Any] = Field(default_factory=dict)
     output_path: str
     
 @dataclass
 class RevitContext:
     """Shared context for all agents"""
+    # Spelled out rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = (
+        'project_path', 'project_name', 'active_view_id', 'active_phase_id',
+        'selected_element_ids', 'user_preferences', 'standards_db',
+        'api_docs_index', 'revit_api'
+    )
+    
     project_path: str
     project_name: str
     active_view_id: str
@@ -76,7 +119,7 @@ class RevitContext:
     @property
     def has_selection(self) -> bool:
         """Check if elements are selected"""
-        return len(self.selected_element_ids) > 0
+        return bool(self.selected_element_ids)
         
     @property
     def selection_count(self) -> int:
@@ -1,5 +1,10 @@
 """Utility functions for Revit AI Assistant"""
 
-from .agent_registry import AgentRegistry
-
 __all__ = ['AgentRegistry']
+
+def __getattr__(name):
+    # Defer the agent stack (pydantic_ai, model SDKs) until it is asked for
+    if name == 'AgentRegistry':
+        from .agent_registry import AgentRegistry
+        return AgentRegistry
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,10 +1,22 @@
 """Agent registry and management"""
 
+import asyncio
+import aiofiles
+import copy
+import json
+import threading
 import yaml
-from typing import Dict, Any, List  # Added List import
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple  # Added List import
 import logging
 from pathlib import Path
+from types import MappingProxyType
 
+from .cache import ResponseCache
+from .http import aclose_clients
 from ..agents import (
     BaseRevitAgent,
     OrchestratorAgent,
@@ -13,76 +25,311 @@ from ..agents import (
     StandardsAgent
 )
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+# Specialist agents by config key; the orchestrator is built separately
+_AGENT_CLASSES = MappingProxyType({
+    'api_expert': APIExpertAgent,
+    'dynamo_agent': DynamoAgent,
+    'standards_agent': StandardsAgent,
+    # Add other agents as implemented
+})
+
+# RevitContext fields a cached answer may depend on
+_CONTEXT_FIELDS = ('project_path', 'active_view_id', 'active_phase_id', 'selected_element_ids')
+
+def _context_key(context: Any) -> Optional[str]:
+    """Fingerprint the parts of a context that can change an agent's answer"""
+    # None means the context can't be fingerprinted, so skip the cache
+    if context is None:
+        return ""
+    try:
+        values = [getattr(context, name) for name in _CONTEXT_FIELDS]
+    except AttributeError:
+        return None
+    return json.dumps(values, default=str)
+
+# Parsed configs by resolved path: (mtime, size, data), least recently used first
+_YAML_CACHE: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+_YAML_CACHE_SIZE = 100
+
+class _LazyAgents(Mapping):
+    """Agents by name, each constructed the first time it is looked up"""
+    
+    def __init__(self, logger: logging.Logger):
+        self._logger = logger
+        self._built: Dict[str, BaseRevitAgent] = {}
+        self._factories: Dict[str, Callable[[], BaseRevitAgent]] = {}
+        self._locks: Dict[str, threading.Lock] = {}  # One build per agent across threads
+        # Bumped by clear() so builds still running elsewhere can't repopulate us
+        self._generation = 0
+        self._state_lock = threading.Lock()
+        
+    def register(self, name: str, factory: Callable[[], BaseRevitAgent]):
+        """Record how to build an agent without building it yet"""
+        self._factories[name] = factory
+        self._locks[name] = threading.Lock()
+        
+    def __setitem__(self, name: str, agent: BaseRevitAgent):
+        self._built[name] = agent
+        
+    def __getitem__(self, name: str) -> BaseRevitAgent:
+        agent = self._built.get(name)
+        if agent is not None:
+            return agent
+        generation = self._generation
+        with self._locks[name]:  # KeyError for names never registered
+            agent = self._built.get(name)
+            if agent is None:
+                # Stays registered while building so membership tests still see it
+                factory = self._factories[name]  # KeyError after a failed build
+                try:
+                    agent = factory()
+                except Exception as e:
+                    self._logger.error(f"Failed to initialize {name}: {e}")
+                    # Drop the factory so the agent reads as missing from now on
+                    with self._state_lock:
+                        if self._generation == generation:
+                            del self._factories[name]
+                    raise KeyError(name) from e
+                with self._state_lock:
+                    if self._generation != generation:
+                        raise KeyError(name)  # Cleared while we were building
+                    self._built[name] = agent
+                    del self._factories[name]
+                self._logger.info(f"Initialized {name}")
+        return agent
+        
+    def __contains__(self, name: object) -> bool:
+        return name in self._built or name in self._factories
+        
+    def __iter__(self) -> Iterator[str]:
+        return iter([*self._built, *self._factories])
+        
+    def __len__(self) -> int:
+        return len(self._built) + len(self._factories)
+        
+    def peek(self, name: str) -> Optional[BaseRevitAgent]:
+        """Return an agent only if it has already been built"""
+        return self._built.get(name)
+        
+    def pending(self) -> List[str]:
+        """Names registered but not built yet"""
+        return list(self._factories)
+        
+    def built(self) -> List[BaseRevitAgent]:
+        """Agents constructed so far"""
+        return list(self._built.values())
+        
+    def clear(self):
+        with self._state_lock:
+            self._generation += 1
+            self._built.clear()
+            self._factories.clear()
+            self._locks.clear()
+
 class AgentRegistry:
     """Manages all agents and their lifecycle"""
     
-    def __init__(self, config_path: str = "config/default_config.yaml"):
+    def __init__(self, config_path: str = "config/default_config.yaml", use_cache: bool = True,
+                 max_concurrency: Optional[int] = None):
         self.logger = logging.getLogger("AgentRegistry")
-        self.config = self._load_config(config_path)
-        self.agents: Dict[str, BaseRevitAgent] = {}
+        self.config_path = config_path
+        self.config: Optional[Dict[str, Any]] = None  # Loaded by initialize_agents
+        self.agents = _LazyAgents(self.logger)
+        self.use_cache = use_cache
+        self.max_concurrency = max_concurrency
+        self._cache: Optional[ResponseCache] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
         self._initialized = False
         
-    def _load_config(self, config_path: str) -> Dict[str, Any]:
-        """Load configuration from YAML"""
-        path = Path(config_path)
+    async def _load_config(self, config_path: str) -> Dict[str, Any]:
+        """Load configuration from YAML, reusing the parse while the file is unchanged"""
+        path = Path(config_path).resolve()
         if not path.exists():
             self.logger.warning(f"Config file not found: {config_path}")
             return {}
             
-        with open(path, 'r') as f:
-            return yaml.safe_load(f)
+        st = path.stat()
+        key = str(path)
+        cached = _YAML_CACHE.get(key)
+        if cached and cached[0] == st.st_mtime and cached[1] == st.st_size:
+            _YAML_CACHE.move_to_end(key)
+            # Callers may mutate their config, so never hand out the cached tree
+            return copy.deepcopy(cached[2])
+            
+        config = await self._read_config(path, st.st_mtime)
+            
+        _YAML_CACHE[key] = (st.st_mtime, st.st_size, config)
+        _YAML_CACHE.move_to_end(key)
+        while len(_YAML_CACHE) > _YAML_CACHE_SIZE:
+            _YAML_CACHE.popitem(last=False)
+        return copy.deepcopy(config)
+            
+    async def _read_config(self, path: Path, mtime: float) -> Dict[str, Any]:
+        """Parse the YAML config, going through a JSON sidecar when it is current"""
+        sidecar = path.with_suffix(path.suffix + '.cache.json')
+        try:
+            if sidecar.stat().st_mtime >= mtime:
+                async with aiofiles.open(sidecar, 'rb') as f:
+                    cached = json.loads(await f.read())
+                if cached.get('src_mtime') == mtime:
+                    return cached['data']
+        except (OSError, ValueError, KeyError):
+            pass  # Missing or unreadable sidecar, fall back to the YAML
+            
+        async with aiofiles.open(path, 'rb') as f:
+            config = yaml.load(await f.read(), Loader=_SafeLoader)
+            
+        try:
+            # Serialize before opening so a bad value never leaves a partial file
+            data = json.dumps({'src_mtime': mtime, 'data': config})
+            if json.loads(data)['data'] != config:
+                # JSON silently turns int or bool mapping keys into strings;
+                # a lossy sidecar would hand later starts a different config
+                sidecar.unlink(missing_ok=True)
+                raise ValueError("config does not round-trip through JSON")
+            async with aiofiles.open(sidecar, 'w') as f:
+                await f.write(data)
+        except (OSError, TypeError, ValueError) as e:
+            # Read-only deployments or non-JSON values just skip the sidecar
+            self.logger.debug("Could not write config cache %s: %s", sidecar, e)
+        return config
             
     async def initialize_agents(self):
-        """Initialize all configured agents"""
+        """Register all configured agents; specialists are built on first lookup"""
         if self._initialized:
             return
             
+        if self.config is None:
+            self.config = await self._load_config(self.config_path)
         model_configs = self.config.get('models', {})
         
+        performance = self.config.get('performance', {})
+        
+        # Created here rather than in __init__ so it binds to the running loop
+        if self.max_concurrency is None:
+            self.max_concurrency = performance.get('max_concurrent_agents', 16)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        if self.use_cache and performance.get('cache_responses', False):
+            self._cache = ResponseCache(
+                performance.get('cache_path', './cache/responses.db'),
+                ttl=performance.get('cache_ttl')
+            )
+            
         # Initialize specialized agents first
-        agent_classes = {
-            'api_expert': APIExpertAgent,
-            'dynamo_agent': DynamoAgent,
-            'standards_agent': StandardsAgent,
-            # Add other agents as implemented
-        }
-        
-        for agent_name, agent_class in agent_classes.items():
+        for agent_name, agent_class in _AGENT_CLASSES.items():
             if agent_name in model_configs:
-                try:
-                    self.agents[agent_name] = agent_class(
-                        model_configs[agent_name],
-                        agent_name
-                    )
-                    self.logger.info(f"Initialized {agent_name}")
-                except Exception as e:
-                    self.logger.error(f"Failed to initialize {agent_name}: {e}")
+                self.agents.register(
+                    agent_name,
+                    partial(agent_class, model_configs[agent_name], agent_name)
+                )
                     
         # Initialize orchestrator last (needs other agents)
         if 'orchestrator' in model_configs:
             try:
                 self.agents['orchestrator'] = OrchestratorAgent(
                     model_configs['orchestrator'],
-                    self.agents  # Pass all other agents
+                    # Read-only live view of the other agents; lookups build them on demand
+                    MappingProxyType(self.agents),
+                    dispatch=self.process
                 )
                 self.logger.info("Initialized orchestrator")
             except Exception as e:
                 self.logger.error(f"Failed to initialize orchestrator: {e}")
                 
         self._initialized = True
-        self.logger.info(f"Initialized {len(self.agents)} agents")
+        self.logger.info(f"Registered {len(self.agents)} agents")
         
-    def get_agent(self, name: str) -> BaseRevitAgent:
-        """Get a specific agent by name"""
+    def get_agent(self, name: str) -> Optional[BaseRevitAgent]:
+        """Get a specific agent by name, building it on first use"""
         return self.agents.get(name)
         
+    async def aget_agent(self, name: str) -> Optional[BaseRevitAgent]:
+        """Get a specific agent by name without blocking the event loop"""
+        agent = self.agents.peek(name)
+        if agent is None and name in self.agents:
+            # Building, or waiting on another thread's build, happens off the loop
+            loop = asyncio.get_running_loop()
+            agent = await loop.run_in_executor(self._executor(), self.agents.get, name)
+        return agent
+        
+    def _executor(self) -> ThreadPoolExecutor:
+        """Thread pool that agent constructors run on"""
+        # Constructors block and may spin up event loops of their own, so
+        # each one runs on a dedicated pool thread instead of sharing ours
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=len(_AGENT_CLASSES) + 1,
+                thread_name_prefix="agent-init"
+            )
+        return self._pool
+        
+    async def process(self, agent_name: str, query: str, context: Any) -> Any:
+        """Process a query with the named agent, consulting the response cache"""
+        agent = await self.aget_agent(agent_name)
+        if not agent:
+            raise ValueError(f"Agent not available: {agent_name}")
+            
+        context_key = _context_key(context)
+        if self._cache is None or context_key is None:
+            async with self._semaphore:
+                return await agent.process(query, context)
+            
+        # Key on the context too, so answers are only reused for the same
+        # project, view, phase and selection
+        model = f"{agent_name}:{getattr(agent.model, 'model_name', '')}"
+        prompt = f"{query}\0{context_key}"
+        cached = self._cache.get(model, prompt)
+        if cached is not None:
+            return agent.get_output_type().model_validate_json(cached)
+            
+        async with self._semaphore:
+            result = await agent.process(query, context)
+        self._cache.set(model, prompt, result.model_dump_json().encode())
+        return result
+        
+    async def process_many(self, agent_name: str, prompts: List[str], context: Any) -> List[Any]:
+        """Run several prompts through one agent concurrently"""
+        if not await self.aget_agent(agent_name):
+            raise ValueError(f"Agent not available: {agent_name}")
+            
+        return await asyncio.gather(
+            # In prompt order; a failed prompt yields its exception in place
+            *(self.process(agent_name, prompt, context) for prompt in prompts),
+            return_exceptions=True
+        )
+        
+    async def warm_up(self):
+        """Build any pending agents and ping their model endpoints"""
+        await asyncio.gather(*(self.aget_agent(name) for name in self.agents.pending()))
+        
+        checks = [
+            agent.model.health_check()
+            for agent in self.agents.built()
+            if hasattr(agent.model, 'health_check')
+        ]
+        await asyncio.gather(*checks, return_exceptions=True)
+        
     def list_agents(self) -> List[str]:
-        """List all available agent names"""
+        """List all configured agent names, built or not"""
         return list(self.agents.keys())
         
     async def shutdown(self):
         """Cleanup all agents"""
-        # Any cleanup needed
         self.logger.info("Shutting down agents")
         self.agents.clear()
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+        await aclose_clients()
+        if self._pool is not None:
+            # Don't hold the loop for builds in progress; clear() discards them
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
         self._initialized = False
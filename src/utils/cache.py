@@ -0,0 +1,56 @@
+"""Persistent response cache for agent queries"""
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+class ResponseCache:
+    """SQLite-backed cache keyed by SHA-256 of model name and prompt"""
+
+    def __init__(self, path: str = "./cache/responses.db", ttl: Optional[float] = None):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key BLOB PRIMARY KEY, value BLOB, created INTEGER)"
+        )
+        if ttl is not None:
+            # Nothing else prunes the table, so drop what expired since last run
+            self._conn.execute("DELETE FROM cache WHERE created < ?", (time.time() - ttl,))
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> bytes:
+        """Content address for a model/prompt pair"""
+        return hashlib.sha256(f"{model}\0{prompt}".encode()).digest()
+
+    def get(self, model: str, prompt: str) -> Optional[bytes]:
+        """Return the cached value, or None on a miss or expired entry"""
+        key = self.make_key(model, prompt)
+        row = self._conn.execute(
+            "SELECT value, created FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, created = row
+        if self.ttl is not None and time.time() - created > self.ttl:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+            return None
+        return value
+
+    def set(self, model: str, prompt: str, value: bytes):
+        """Store a value, replacing any previous entry"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, created) VALUES (?, ?, ?)",
+            (self.make_key(model, prompt), value, int(time.time()))
+        )
+        self._conn.commit()
+
+    def close(self):
+        """Close the underlying database connection"""
+        self._conn.close()
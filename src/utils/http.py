@@ -0,0 +1,66 @@
+"""Shared HTTP clients for local LLM servers"""
+
+import asyncio
+import threading
+from typing import Callable, Dict, Optional, Tuple
+import httpx
+
+_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=100,
+    keepalive_expiry=30.0
+)
+
+_ENDPOINT_LIMITS = httpx.Limits(
+    max_keepalive_connections=32,
+    max_connections=64,
+    keepalive_expiry=60.0
+)
+
+# Keep-alive connections belong to the event loop that opened them, so
+# pools are keyed by (loop, base_url); base_url None is the probe client
+_ClientKey = Tuple[Optional[asyncio.AbstractEventLoop], Optional[str]]
+_CLIENTS: Dict[_ClientKey, httpx.AsyncClient] = {}
+_CLIENTS_LOCK = threading.Lock()  # Agents may be constructed on worker threads
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+def _pooled(base_url: Optional[str], factory: Callable[[], httpx.AsyncClient]) -> httpx.AsyncClient:
+    """Return this loop's client for base_url, creating it if needed"""
+    key = (_running_loop(), base_url)
+    with _CLIENTS_LOCK:
+        # Clients of finished loops can't even be closed any more, just dropped
+        for stale in [k for k in _CLIENTS if k[0] is not None and k[0].is_closed()]:
+            del _CLIENTS[stale]
+        client = _CLIENTS.get(key)
+        if client is None or client.is_closed:
+            client = _CLIENTS[key] = factory()
+        return client
+
+def get_client() -> httpx.AsyncClient:
+    """Return the pooled probe client, creating it on first use"""
+    return _pooled(None, lambda: httpx.AsyncClient(limits=_LIMITS, timeout=httpx.Timeout(2.0)))
+
+def get_endpoint_client(base_url: str) -> httpx.AsyncClient:
+    """Return the pooled client shared by every model on an endpoint"""
+    # Callers must not close it themselves; aclose_clients() owns shutdown
+    return _pooled(base_url, lambda: httpx.AsyncClient(
+        base_url=base_url,
+        timeout=httpx.Timeout(120.0, connect=5.0),  # Longer timeout for local models
+        limits=_ENDPOINT_LIMITS
+    ))
+
+async def aclose_clients():
+    """Close the running loop's pooled clients and drop their keep-alive connections"""
+    loop = _running_loop()
+    with _CLIENTS_LOCK:
+        keys = [k for k in _CLIENTS if k[0] is None or k[0] is loop or k[0].is_closed()]
+        clients = [_CLIENTS.pop(k) for k in keys if k[0] is None or not k[0].is_closed()]
+        for k in keys:
+            _CLIENTS.pop(k, None)
+    for client in clients:
+        await client.aclose()
\ No newline at end of file
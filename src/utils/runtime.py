@@ -0,0 +1,21 @@
+"""Event loop selection for entry points"""
+
+import asyncio
+import sys
+
+def run(main):
+    """Run a coroutine to completion, on uvloop when it is installed
+    
+    uvloop has no Windows build, so there (or when it is missing) this
+    falls back to the standard asyncio loop.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+        
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(main)
+    uvloop.install()
+    return asyncio.run(main)
\ No newline at end of file